@@ -5,7 +5,8 @@ capabilities over the A2A protocol.
 Handles:
   - One-shot message/send requests
   - Streaming message/sendStream with progress updates
-  - Multi-turn conversations via Claude session resumption
+  - Multi-turn conversations on a persistent Claude Code process per task
+    (falling back to Claude session resumption)
   - File artifacts produced by Claude
   - Cancellation
 """
@@ -18,10 +19,11 @@ import logging
 import os
 import tempfile
 import time
+from collections import OrderedDict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
-from uuid import uuid4
+from typing import Any, AsyncIterator, Iterator
+from uuid import UUID
 
 from typing_extensions import override
 
@@ -42,7 +44,7 @@ from a2a.types import (
 )
 
 from claude_agent_sdk import (
-    query,
+    ClaudeSDKClient,
     ClaudeAgentOptions,
     SdkPluginConfig,
     AssistantMessage,
@@ -61,6 +63,10 @@ logger = logging.getLogger(__name__)
 
 _verbose_enabled: bool = False
 
+# Console lines are cut to this many characters to keep logs readable
+_CONSOLE_MAX_CHARS = 500
+_BANNER_RULE = "=" * 60
+
 
 def _log_to_console(tag: str, message: str, task_id: str | None = None) -> None:
     """Print a formatted line to stdout so operators can watch progress."""
@@ -68,11 +74,38 @@ def _log_to_console(tag: str, message: str, task_id: str | None = None) -> None:
         return
     prefix = f"[task={task_id}] " if task_id else ""
     # Truncate very long messages to keep logs readable
-    if len(message) > 500:
-        message = message[:500] + "…"
+    if len(message) > _CONSOLE_MAX_CHARS:
+        message = message[:_CONSOLE_MAX_CHARS] + "…"
     print(f"  {prefix}{tag}: {message}", flush=True)
 
 
+def _summarize_tool_input(tool_input: Any, max_chars: int | None = None) -> str:
+    """Render a tool's input for logging, as JSON when it is a dict.
+
+    With *max_chars*, encoding stops once that many characters have been
+    produced, so a tool call carrying a whole file isn't serialized in full
+    just to be truncated for the console.
+    """
+    if tool_input is None:
+        return ""
+    if not isinstance(tool_input, dict):
+        return str(tool_input)
+    if max_chars is None:
+        return json.dumps(tool_input, default=str)
+    # Cut long top-level strings (file contents, commands) before encoding
+    tool_input = {
+        k: v[:max_chars] if isinstance(v, str) else v for k, v in tool_input.items()
+    }
+    chunks: list[str] = []
+    size = 0
+    for chunk in json.JSONEncoder(default=str).iterencode(tool_input):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_chars:
+            break
+    return "".join(chunks)
+
+
 # ---------------------------------------------------------------------------
 # MCP server registry
 # ---------------------------------------------------------------------------
@@ -105,16 +138,93 @@ def extract_user_text(context: RequestContext) -> str:
     return "\n".join(parts) if parts else ""
 
 
+def _uuid_pool(batch: int = 1024) -> Iterator[UUID]:
+    """Yield random (version 4) UUIDs, drawing entropy in batches of *batch*."""
+    while True:
+        buf = os.urandom(16 * batch)
+        for i in range(0, len(buf), 16):
+            yield UUID(bytes=buf[i:i + 16], version=4)
+
+
+_uuids = _uuid_pool()
+
+
+def _new_id() -> str:
+    """Return a fresh random ID for an A2A message, artifact or workspace."""
+    return str(next(_uuids))
+
+
 def new_agent_text_message(text: str, final: bool = True) -> Message:
     """Convenience: create an A2A Message from the agent role."""
     return Message(
         role=Role.agent,
         parts=[Part(root=TextPart(text=text))],
-        messageId=str(uuid4()),
+        messageId=_new_id(),
         final=final,
     )
 
 
+# ---------------------------------------------------------------------------
+# Progress updates  (coalesced streaming text)
+# ---------------------------------------------------------------------------
+
+_PROGRESS_FLUSH_SECONDS = 0.05
+
+
+class _ProgressCoalescer:
+    """Batches Claude's streamed text into fewer ``working`` status updates.
+
+    Text added within :data:`_PROGRESS_FLUSH_SECONDS` of the first buffered
+    chunk goes out as one ``TaskStatusUpdateEvent``. Callers :meth:`flush`
+    before emitting any other event, so updates keep their order.
+    """
+
+    def __init__(self, event_queue: EventQueue, task_id: str, context_id: str):
+        self._event_queue = event_queue
+        self._task_id = task_id
+        self._context_id = context_id
+        self._chunks: list[str] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._pending: set[asyncio.Task] = set()
+
+    def add(self, text: str) -> None:
+        self._chunks.append(text)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                _PROGRESS_FLUSH_SECONDS, self._flush_later
+            )
+
+    def _flush_later(self) -> None:
+        task = asyncio.create_task(self.flush())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def flush(self) -> None:
+        """Emit the buffered text (if any) as a single status update."""
+        self.discard()
+        if not self._chunks:
+            return
+        text = "\n".join(self._chunks)
+        self._chunks = []
+        await self._event_queue.enqueue_event(
+            TaskStatusUpdateEvent(
+                taskId=self._task_id,
+                contextId=self._context_id,
+                status=TaskStatus(
+                    state=TaskState.working,
+                    message=new_agent_text_message(text, final=False),
+                ),
+                final=False,
+            )
+        )
+
+    def discard(self) -> None:
+        """Cancel a scheduled flush (any buffered text is kept)."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+
 # ---------------------------------------------------------------------------
 # Execution logger  (structured JSONL logs for later analysis)
 # ---------------------------------------------------------------------------
@@ -176,6 +286,15 @@ class ClaudeCodeConfig:
                          One file per task. None = logging disabled.
         run_id:          Label for this server run (used as subdirectory
                          under log_dir). Defaults to an ISO-8601 timestamp.
+        session_idle_timeout: Seconds a task's Claude Code process is kept
+                         alive waiting for a follow-up message. Later
+                         messages resume the session in a new process.
+                         0 = stop the process after every message.
+        max_idle_sessions: Most idle Claude Code processes kept at once; when
+                         another task's process is parked, the one idle the
+                         longest is stopped. Each is a running Node.js
+                         process holding its memory, so this is off by
+                         default (0 = keep none).
 
     Example:
         Configure a plugin-enabled, logging server and hand it to an executor:
@@ -214,6 +333,8 @@ class ClaudeCodeConfig:
         verbose: bool = False,
         log_dir: str | Path | None = None,
         run_id: str | None = None,
+        session_idle_timeout: float = 300.0,
+        max_idle_sessions: int = 0,
     ):
         self.workspace_root = Path(
             workspace_root or tempfile.mkdtemp(prefix="claude_a2a_")
@@ -238,6 +359,8 @@ class ClaudeCodeConfig:
         self.verbose = verbose
         self.log_dir = Path(log_dir) if log_dir else None
         self.run_id = run_id
+        self.session_idle_timeout = session_idle_timeout
+        self.max_idle_sessions = max_idle_sessions
 
         # Set module-level flag so _log_to_console can check it
         global _verbose_enabled
@@ -249,21 +372,136 @@ class ClaudeCodeConfig:
 # ---------------------------------------------------------------------------
 
 class SessionTracker:
-    """Maps A2A task IDs to Claude Agent SDK session IDs for resume."""
+    """Maps A2A task IDs to Claude Agent SDK session IDs for resume.
+
+    Bounded so a long-running server doesn't accumulate every task it has
+    seen: entries expire *ttl_seconds* after they were last set, and beyond
+    *max_size* entries the least recently set one is dropped.
+    """
 
-    def __init__(self):
-        self._sessions: dict[str, str] = {}
+    def __init__(self, max_size: int = 10_000, ttl_seconds: float | None = 86_400):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        # task_id -> (session_id, time.monotonic() when set), oldest first
+        self._sessions: OrderedDict[str, tuple[str, float]] = OrderedDict()
 
     def get(self, task_id: str) -> str | None:
-        return self._sessions.get(task_id)
+        entry = self._sessions.get(task_id)
+        if entry is None:
+            return None
+        session_id, set_at = entry
+        if self.ttl_seconds is not None and time.monotonic() - set_at > self.ttl_seconds:
+            del self._sessions[task_id]
+            return None
+        return session_id
 
     def set(self, task_id: str, session_id: str) -> None:
-        self._sessions[task_id] = session_id
+        self._sessions[task_id] = (session_id, time.monotonic())
+        self._sessions.move_to_end(task_id)
+        while len(self._sessions) > self.max_size:
+            self._sessions.popitem(last=False)
 
     def remove(self, task_id: str) -> None:
         self._sessions.pop(task_id, None)
 
 
+# ---------------------------------------------------------------------------
+# Persistent session  (one live Claude Code process per A2A task)
+# ---------------------------------------------------------------------------
+
+_TURN_DONE = object()
+
+
+class _PersistentSession:
+    """A Claude Code process kept alive across the messages of one A2A task.
+
+    Starting Claude Code takes seconds, so follow-up messages are sent to
+    the already-running process instead of spawning a new one per message.
+    The SDK client must be connected, used and disconnected from a single
+    asyncio task, so a dedicated task owns it; callers hand it prompts via
+    :meth:`turn` and read back that turn's messages.
+    """
+
+    def __init__(self, options: ClaudeAgentOptions):
+        self._options = options
+        self._client: ClaudeSDKClient | None = None
+        self._turn_out: asyncio.Queue | None = None  # queue turn() reads from
+        self._turns: asyncio.Queue[tuple[str, asyncio.Queue] | None] = asyncio.Queue()
+        self._task = asyncio.create_task(self._run())
+        self.idle_handle: asyncio.TimerHandle | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self._task.done()
+
+    async def _run(self) -> None:
+        client = ClaudeSDKClient(options=self._options)
+        try:
+            while (turn := await self._turns.get()) is not None:
+                prompt, out = turn
+                try:
+                    if self._client is None:
+                        await client.connect()
+                        self._client = client
+                    await client.query(prompt)
+                    async for msg in client.receive_response():
+                        out.put_nowait(msg)
+                except Exception as exc:
+                    # The process is in an unknown state; end the session
+                    out.put_nowait(exc)
+                    return
+                out.put_nowait(_TURN_DONE)
+        finally:
+            self._client = None
+            try:
+                await client.disconnect()
+            except Exception:
+                logger.debug("Error disconnecting Claude session", exc_info=True)
+
+    async def turn(self, prompt: str) -> AsyncIterator[Any]:
+        """Send *prompt* and yield messages up to and including its result."""
+        if self.closed:
+            raise RuntimeError("Claude session is closed")
+        out: asyncio.Queue = asyncio.Queue()
+        self._turn_out = out
+        self._turns.put_nowait((prompt, out))
+        try:
+            while (item := await out.get()) is not _TURN_DONE:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Don't let a late stop_turn() end the next turn's iteration
+            if self._turn_out is out:
+                self._turn_out = None
+
+    def stop_turn(self) -> None:
+        """End the caller's :meth:`turn` iterator without waiting for Claude.
+
+        Claude Code itself keeps working on the turn; a stopped turn never
+        completes, so the session is then closed with ``abort=True``, which
+        cancels the owning task and so disconnects the client from it.
+        """
+        if self._turn_out is not None:
+            self._turn_out.put_nowait(_TURN_DONE)
+
+    async def close(self, abort: bool = False) -> None:
+        """Stop the Claude Code process once the current turn is done.
+
+        With *abort*, stop it right away instead: the owning task is
+        cancelled, so a turn nobody is reading (or a process still starting
+        up) doesn't keep running.
+        """
+        if self.idle_handle:
+            self.idle_handle.cancel()
+        if not self.closed:
+            if abort:
+                self._task.cancel()
+            else:
+                self._turns.put_nowait(None)
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
 # ---------------------------------------------------------------------------
 # The A2A AgentExecutor
 # ---------------------------------------------------------------------------
@@ -275,11 +513,13 @@ class ClaudeCodeExecutor(AgentExecutor):
     For every incoming A2A message:
       1. Extract the user's text from the A2A Message parts.
       2. Determine or create a per-task workspace directory.
-      3. Call claude_agent_sdk.query() with appropriate options.
+      3. Send it to the task's Claude Code process (started with
+         appropriate options on the task's first message).
       4. Stream progress as TaskStatusUpdateEvents.
       5. Emit the final answer as a TaskArtifactUpdateEvent.
-      6. Track the Claude session ID so subsequent messages on the
-         same A2A task resume the conversation.
+      6. Keep the process alive for the task's next message, and track
+         the Claude session ID so a message arriving after the process has
+         been stopped resumes the conversation in a new one.
 
     Example:
         Wire the executor into an A2A Starlette application (this is what
@@ -314,20 +554,92 @@ class ClaudeCodeExecutor(AgentExecutor):
         self.config = config or ClaudeCodeConfig()
         self.sessions = SessionTracker()
         self._cancel_events: dict[str, asyncio.Event] = {}
+        # Idle processes waiting for a follow-up message (least recently
+        # parked first), and those running one
+        self._idle_sessions: OrderedDict[str, _PersistentSession] = OrderedDict()
+        self._running_sessions: dict[str, _PersistentSession] = {}
+        self._closing: set[asyncio.Task] = set()
         self._exec_logger: ExecutionLogger | None = (
             ExecutionLogger(self.config.log_dir, self.config.run_id)
             if self.config.log_dir else None
         )
 
+        # Resolve the task-independent SDK options once, not per task
+        self._mcp_configs: dict[str, Any] = {}
+        mcp_tools: list[str] = []
+        for name in self.config.mcp_servers:
+            if name not in MCP_REGISTRY:
+                logger.warning("Unknown MCP server %r – skipping", name)
+                continue
+            self._mcp_configs[name] = MCP_REGISTRY[name]
+            mcp_tools.append(f"mcp__{name}__*")
+        self._allowed_tools = list(self.config.allowed_tools) + mcp_tools
+        self._plugins = [
+            SdkPluginConfig(type="local", path=str(p))
+            for p in self.config.plugin_dirs
+        ]
+
     # ----- workspace management -----
 
     def _workspace_for_task(self, task_id: str | None) -> Path:
         """Return (and create) a workspace directory for a given task."""
-        folder_name = task_id or str(uuid4())
+        folder_name = task_id or _new_id()
         ws = self.config.workspace_root / folder_name
         ws.mkdir(parents=True, exist_ok=True)
         return ws
 
+    # ----- persistent sessions -----
+
+    def _checkout_session(
+        self, task_id: str | None, workspace: Path
+    ) -> _PersistentSession:
+        """Take the task's idle Claude process, or start a new one."""
+        session = self._idle_sessions.pop(task_id, None) if task_id else None
+        if session is not None:
+            session.idle_handle.cancel()
+            if not session.closed:
+                return session
+        # A fresh process resumes the task's Claude session, if it has one
+        return _PersistentSession(self._build_options(task_id, workspace))
+
+    def _park_session(self, task_id: str | None, session: _PersistentSession) -> None:
+        """Keep *session* alive for the task's next message, or close it.
+
+        At most ``max_idle_sessions`` are kept; parking one more stops the
+        process that has been idle the longest.
+        """
+        timeout = self.config.session_idle_timeout
+        max_idle = self.config.max_idle_sessions
+        if (
+            not task_id
+            or timeout <= 0
+            or max_idle <= 0
+            or session.closed
+            or task_id in self._idle_sessions
+        ):
+            self._close_soon(session)
+            return
+        while len(self._idle_sessions) >= max_idle:
+            evicted_id, evicted = self._idle_sessions.popitem(last=False)
+            _log_to_console("SESSION", "idle process stopped (limit reached)", evicted_id)
+            self._close_soon(evicted)
+        self._idle_sessions[task_id] = session
+        session.idle_handle = asyncio.get_running_loop().call_later(
+            timeout, self._expire_session, task_id, session
+        )
+
+    def _expire_session(self, task_id: str, session: _PersistentSession) -> None:
+        if self._idle_sessions.get(task_id) is session:
+            del self._idle_sessions[task_id]
+            _log_to_console("SESSION", "idle process stopped", task_id)
+            self._close_soon(session)
+
+    def _close_soon(self, session: _PersistentSession, abort: bool = False) -> None:
+        # Hold a reference so the closing task isn't garbage collected
+        task = asyncio.create_task(session.close(abort))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
     # ----- build SDK options -----
 
     def _build_options(
@@ -335,7 +647,7 @@ class ClaudeCodeExecutor(AgentExecutor):
     ) -> ClaudeAgentOptions:
         opts = ClaudeAgentOptions(
             system_prompt=self.config.system_prompt,
-            allowed_tools=self.config.allowed_tools,
+            allowed_tools=self._allowed_tools,
             permission_mode=self.config.permission_mode,
             cwd=str(workspace),
         )
@@ -344,26 +656,11 @@ class ClaudeCodeExecutor(AgentExecutor):
         if self.config.max_turns:
             opts.max_turns = self.config.max_turns
 
-        # Attach requested MCP servers
-        if self.config.mcp_servers:
-            mcp_configs: dict[str, Any] = {}
-            mcp_tools: list[str] = []
-            for name in self.config.mcp_servers:
-                if name not in MCP_REGISTRY:
-                    logger.warning("Unknown MCP server %r – skipping", name)
-                    continue
-                mcp_configs[name] = MCP_REGISTRY[name]
-                mcp_tools.append(f"mcp__{name}__*")
-            if mcp_configs:
-                opts.mcp_servers = mcp_configs
-                opts.allowed_tools = list(opts.allowed_tools or []) + mcp_tools
-
-        # Attach plugins
-        if self.config.plugin_dirs:
-            opts.plugins = [
-                SdkPluginConfig(type="local", path=str(p))
-                for p in self.config.plugin_dirs
-            ]
+        # Attach requested MCP servers and plugins
+        if self._mcp_configs:
+            opts.mcp_servers = self._mcp_configs
+        if self._plugins:
+            opts.plugins = self._plugins
 
         # Resume an existing Claude session for multi-turn
         if task_id:
@@ -391,6 +688,24 @@ class ClaudeCodeExecutor(AgentExecutor):
 
         task_id = context.task_id
         context_id = context.context_id or ""
+
+        # Signal that we're working before any setup, so the caller hears back
+        # as soon as possible
+        await event_queue.enqueue_event(
+            TaskStatusUpdateEvent(
+                taskId=task_id or "",
+                contextId=context_id,
+                status=TaskStatus(
+                    state=TaskState.working,
+                    message=new_agent_text_message(
+                        "Claude Code is working on your request…",
+                        final=False,
+                    ),
+                ),
+                final=False,
+            )
+        )
+
         workspace = self._workspace_for_task(task_id)
 
         # Set up cancellation signal
@@ -409,92 +724,76 @@ class ClaudeCodeExecutor(AgentExecutor):
             task_id, workspace, len(user_text),
         )
         if self.config.verbose:
-            print(f"\n{'='*60}", flush=True)
-            print(f"  CLAUDE CODE START | task={task_id}", flush=True)
-            print(f"  Prompt: {user_text[:200]}{'…' if len(user_text) > 200 else ''}", flush=True)
-            print(f"{'='*60}", flush=True)
-
-        # Signal that we're working
-        await event_queue.enqueue_event(
-            TaskStatusUpdateEvent(
-                taskId=task_id or "",
-                contextId=context_id,
-                status=TaskStatus(
-                    state=TaskState.working,
-                    message=new_agent_text_message(
-                        "Claude Code is working on your request…",
-                        final=False,
-                    ),
-                ),
-                final=False,
+            # One write per banner keeps it together in interleaved logs
+            print(
+                f"\n{_BANNER_RULE}\n"
+                f"  CLAUDE CODE START | task={task_id}\n"
+                f"  Prompt: {user_text[:200]}{'…' if len(user_text) > 200 else ''}\n"
+                f"{_BANNER_RULE}",
+                flush=True,
             )
-        )
 
-        opts = self._build_options(task_id, workspace)
+        session = self._checkout_session(task_id, workspace)
+        if task_id:
+            self._running_sessions[task_id] = session
+        progress = _ProgressCoalescer(event_queue, task_id or "", context_id)
         collected_text: list[str] = []
         session_id: str | None = None
         usage: dict[str, Any] = {}
         total_cost_usd: float | None = None
+        # Checked once here so the loop below skips console-only work
+        verbose = self.config.verbose
+        logging_task = bool(elog and task_id)
+        # Set once the turn has run to completion; otherwise (failure,
+        # cancellation, or this task being cancelled mid-turn) the session is
+        # abandoned and its process stopped
+        completed = False
 
         try:
-            async for msg in query(prompt=user_text, options=opts):
-                # Check for cancellation
+            # cancel() also ends this iteration, so it needn't wait for
+            # Claude's next message
+            async for msg in session.turn(user_text):
+                # Don't process messages queued before the cancellation
                 if cancel_event.is_set():
-                    logger.info("Task %s cancelled during execution", task_id)
-                    await event_queue.enqueue_event(
-                        TaskStatusUpdateEvent(
-                            taskId=task_id or "",
-                            contextId=context_id,
-                            status=TaskStatus(state=TaskState.canceled),
-                            final=True,
-                        )
-                    )
-                    return
+                    break
 
                 if isinstance(msg, AssistantMessage):
                     for block in msg.content:
                         if isinstance(block, TextBlock) and block.text:
                             collected_text.append(block.text)
-                            _log_to_console("ASSISTANT", block.text, task_id)
-                            if elog and task_id:
+                            if verbose:
+                                _log_to_console("ASSISTANT", block.text, task_id)
+                            if logging_task:
                                 elog.log(task_id, "assistant_text",
                                          text=block.text)
 
-                            # Emit intermediate streaming update
-                            await event_queue.enqueue_event(
-                                TaskStatusUpdateEvent(
-                                    taskId=task_id or "",
-                                    contextId=context_id,
-                                    status=TaskStatus(
-                                        state=TaskState.working,
-                                        message=new_agent_text_message(
-                                            block.text, final=False
-                                        ),
-                                    ),
-                                    final=False,
-                                )
-                            )
+                            # Intermediate streaming update (batched)
+                            progress.add(block.text)
 
                         elif isinstance(block, ToolUseBlock):
-                            # Log tool use with input summary
-                            tool_input = getattr(block, "input", None)
-                            input_summary = ""
-                            if isinstance(tool_input, dict):
-                                input_summary = json.dumps(tool_input, default=str)
-                            elif tool_input is not None:
-                                input_summary = str(tool_input)
-                            _log_to_console(
-                                "TOOL_USE",
-                                f"{block.name}({input_summary})",
-                                task_id,
-                            )
-                            if elog and task_id:
-                                elog.log(task_id, "tool_use",
-                                         tool=block.name,
-                                         input=input_summary)
+                            # Log tool use with input summary (only
+                            # serialized when something will read it)
+                            if verbose or logging_task:
+                                # The execution log keeps the full input;
+                                # the console only shows its start
+                                input_summary = _summarize_tool_input(
+                                    getattr(block, "input", None),
+                                    None if logging_task else _CONSOLE_MAX_CHARS,
+                                )
+                                if verbose:
+                                    _log_to_console(
+                                        "TOOL_USE",
+                                        f"{block.name}({input_summary})",
+                                        task_id,
+                                    )
+                                if logging_task:
+                                    elog.log(task_id, "tool_use",
+                                             tool=block.name,
+                                             input=input_summary)
 
                             # Notify the caller which tool Claude is using
                             tool_msg = f"🔧 Using tool: {block.name}"
+                            await progress.flush()
                             await event_queue.enqueue_event(
                                 TaskStatusUpdateEvent(
                                     taskId=task_id or "",
@@ -514,22 +813,38 @@ class ClaudeCodeExecutor(AgentExecutor):
                     session_id = getattr(msg, "session_id", None)
                     usage = getattr(msg, "usage", None) or {}
                     total_cost_usd = getattr(msg, "total_cost_usd", None)
-                    _log_to_console("RESULT", f"session_id={session_id}", task_id)
-                    if elog and task_id:
+                    if verbose:
+                        _log_to_console("RESULT", f"session_id={session_id}", task_id)
+                    if logging_task:
                         elog.log(task_id, "result",
                                  session_id=session_id,
                                  usage=usage,
                                  total_cost_usd=total_cost_usd)
 
-                else:
+                elif verbose:
                     _log_to_console("MSG", f"{type(msg).__name__}", task_id)
 
+            if cancel_event.is_set():
+                logger.info("Task %s cancelled during execution", task_id)
+                await progress.flush()
+                await event_queue.enqueue_event(
+                    TaskStatusUpdateEvent(
+                        taskId=task_id or "",
+                        contextId=context_id,
+                        status=TaskStatus(state=TaskState.canceled),
+                        final=True,
+                    )
+                )
+                return
+            completed = True
+
         except Exception as exc:
             logger.exception("Claude Code execution failed for task %s", task_id)
             if elog and task_id:
                 elog.log(task_id, "error", error=str(exc))
             if self.config.verbose:
                 print(f"  ERROR | task={task_id}: {exc}", flush=True)
+            await progress.flush()
             await event_queue.enqueue_event(
                 TaskStatusUpdateEvent(
                     taskId=task_id or "",
@@ -545,12 +860,19 @@ class ClaudeCodeExecutor(AgentExecutor):
             )
             return
         finally:
+            progress.discard()
             if task_id:
                 self._cancel_events.pop(task_id, None)
+                self._running_sessions.pop(task_id, None)
+            if completed:
+                # Store session for multi-turn
+                if task_id and session_id:
+                    self.sessions.set(task_id, session_id)
+                self._park_session(task_id, session)
+            else:
+                self._close_soon(session, abort=True)
 
-        # Store session for multi-turn
-        if task_id and session_id:
-            self.sessions.set(task_id, session_id)
+        await progress.flush()
 
         # Log completion
         final_text = "\n".join(collected_text) if collected_text else "Done."
@@ -564,7 +886,7 @@ class ClaudeCodeExecutor(AgentExecutor):
                 taskId=task_id or "",
                 contextId=context_id,
                 artifact=Artifact(
-                    artifactId=str(uuid4()),
+                    artifactId=_new_id(),
                     parts=[Part(root=TextPart(text=final_text))],
                     name="claude_code_response",
                     lastChunk=True,
@@ -583,7 +905,7 @@ class ClaudeCodeExecutor(AgentExecutor):
                     taskId=task_id or "",
                     contextId=context_id,
                     artifact=Artifact(
-                        artifactId=str(uuid4()),
+                        artifactId=_new_id(),
                         parts=[Part(root=TextPart(
                             text=json.dumps(usage_data),
                         ))],
@@ -605,9 +927,12 @@ class ClaudeCodeExecutor(AgentExecutor):
         )
 
         if self.config.verbose:
-            print(f"{'='*60}", flush=True)
-            print(f"  CLAUDE CODE DONE | task={task_id} | response_len={len(final_text)}", flush=True)
-            print(f"{'='*60}\n", flush=True)
+            print(
+                f"{_BANNER_RULE}\n"
+                f"  CLAUDE CODE DONE | task={task_id} | response_len={len(final_text)}\n"
+                f"{_BANNER_RULE}\n",
+                flush=True,
+            )
 
         logger.info(
             "Claude Code completed | task=%s response_len=%d",
@@ -627,6 +952,11 @@ class ClaudeCodeExecutor(AgentExecutor):
         cancel_event = self._cancel_events.get(task_id or "")
         if cancel_event:
             cancel_event.set()
+            session = self._running_sessions.get(task_id or "")
+            if session:
+                # execute() then aborts the session; the SDK client may
+                # only be used from the session's own task
+                session.stop_turn()
             logger.info("Cancel signal sent for task %s", task_id)
         else:
             # Task isn't currently running; mark it cancelled anyway
@@ -8,10 +8,14 @@ Run:
 
 from __future__ import annotations
 
+import hashlib
 import logging
 import os
 import click
 import uvicorn
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
 
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
@@ -21,6 +25,10 @@ from a2a.types import (
     AgentCard,
     AgentSkill,
 )
+from a2a.utils.constants import (
+    AGENT_CARD_WELL_KNOWN_PATH,
+    PREV_AGENT_CARD_WELL_KNOWN_PATH,
+)
 
 from claude_a2a.claude_code_executor import ClaudeCodeConfig, ClaudeCodeExecutor
 
@@ -119,6 +127,36 @@ def build_agent_card(host: str, port: int) -> AgentCard:
     )
 
 
+def agent_card_routes(agent_card: AgentCard) -> list[Route]:
+    """Build routes serving *agent_card* from JSON serialized once.
+
+    The A2A application re-serializes the card on every discovery request;
+    these routes return the same body, rendered at startup, with an ``ETag``
+    so clients can revalidate without downloading it again.
+
+    Args:
+        agent_card: The card to serve.
+
+    Returns:
+        GET routes for the current and the legacy well-known card paths.
+    """
+    body = JSONResponse(agent_card.model_dump(exclude_none=True, by_alias=True)).body
+    headers = {
+        "Cache-Control": "public, max-age=300",
+        "ETag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+    }
+
+    async def get_agent_card(request: Request) -> Response:
+        if request.headers.get("if-none-match") == headers["ETag"]:
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    return [
+        Route(path, get_agent_card, methods=["GET"])
+        for path in (AGENT_CARD_WELL_KNOWN_PATH, PREV_AGENT_CARD_WELL_KNOWN_PATH)
+    ]
+
+
 # ---------------------------------------------------------------------------
 # CLI entry point
 # ---------------------------------------------------------------------------
@@ -170,6 +208,18 @@ def build_agent_card(host: str, port: int) -> AgentCard:
     default=None,
     help="Label for this server run (subdirectory under log-dir, default: ISO-8601 timestamp)",
 )
+@click.option(
+    "--session-idle-timeout",
+    default=300.0,
+    type=float,
+    help="Seconds to keep a task's Claude Code process alive for follow-up messages (default: 300, 0 = stop after each message)",
+)
+@click.option(
+    "--max-idle-sessions",
+    default=0,
+    type=int,
+    help="Most idle Claude Code processes to keep for follow-up messages; each is a running Node.js process and keeps its memory, and the longest-idle one is stopped first (default: 0 = keep none)",
+)
 def main(
     host: str,
     port: int,
@@ -181,6 +231,8 @@ def main(
     verbose: bool,
     log_dir: str | None,
     run_id: str | None,
+    session_idle_timeout: float,
+    max_idle_sessions: int,
 ):
     """Start the Claude Code A2A server."""
 
@@ -195,6 +247,8 @@ def main(
         verbose=verbose,
         log_dir=log_dir,
         run_id=run_id,
+        session_idle_timeout=session_idle_timeout,
+        max_idle_sessions=max_idle_sessions,
     )
 
     executor = ClaudeCodeExecutor(config=config)
@@ -208,7 +262,9 @@ def main(
     app = A2AStarletteApplication(
         agent_card=agent_card,
         http_handler=request_handler,
-    )
+    ).build()
+    # Matched ahead of the A2A app's own (per-request serializing) card routes
+    app.router.routes[:0] = agent_card_routes(agent_card)
 
     click.echo(f"🚀 Claude Code A2A server starting on http://{host}:{port}")
     click.echo(f"📋 Agent Card → http://{host}:{port}/.well-known/agent.json")
@@ -216,7 +272,10 @@ def main(
     if config.log_dir and executor._exec_logger:
         click.echo(f"📝 Execution logs → {executor._exec_logger.run_dir}")
 
-    uvicorn.run(app.build(), host=host, port=port)
+    # uvicorn's default loop/http "auto" settings pick uvloop and httptools
+    # when they are installed (uvicorn[standard], as in the Docker image)
+    # and fall back to asyncio and h11 otherwise.
+    uvicorn.run(app, host=host, port=port)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,159 @@
+"""Long-lived fork server used by ``eval.shared.run_tests``.
+
+Imports the heavy evaluation dependencies once, then runs each test script
+read from stdin in a child forked from this already-initialised process. Every
+test still gets its own process (nothing leaks between tests), but none of
+them pays interpreter startup or ``import starsim`` again. Requests are
+handled concurrently: a child is forked as soon as its request arrives, and
+its response is written when it finishes, so responses can arrive out of
+order. On platforms without ``os.fork`` scripts run one at a time in the
+worker itself.
+
+Protocol (one JSON object per line):
+    ready:    ``{"ready": true}`` (written once, after the imports)
+    request:  ``{"id": <int>, "script": "<python source>", "timeout": <seconds>}``
+    response: ``{"id": <int>, "ok": true|false, "error": "<traceback or empty>",
+              "timeout": true|false}``
+
+The worker exits when stdin is closed, killing any tests still running.
+"""
+
+import contextlib
+import json
+import os
+import select
+import signal
+import sys
+import time
+import traceback
+
+# Preload the dependencies test preambles import; missing ones are imported
+# (and fail) inside the test script itself, as they would in a fresh process.
+for _module in ("numpy", "starsim"):
+    try:
+        __import__(_module)
+    except ImportError:
+        pass
+
+
+def _run(script: str) -> dict:
+    """Execute *script* in a fresh ``__main__`` namespace."""
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            exec(compile(script, "<test>", "exec"), {"__name__": "__main__"})
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            return {"ok": False, "error": f"SystemExit: {exc.code}", "timeout": False}
+    except BaseException:
+        # Only the tail is reported; keep responses small
+        return {"ok": False, "error": traceback.format_exc()[-500:], "timeout": False}
+    return {"ok": True, "error": "", "timeout": False}
+
+
+class _Child:
+    """A forked test process and the pipe it reports its result on."""
+
+    def __init__(self, request_id: int, pid: int, deadline: float):
+        self.request_id = request_id
+        self.pid = pid
+        self.deadline = deadline
+        self.chunks: list[bytes] = []
+
+
+def _fork(script: str) -> tuple[int, int]:
+    """Fork a child that runs *script*; return its pid and result-pipe read end."""
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        # Child: keep the test's output off the protocol pipe, then report back.
+        os.close(read_fd)
+        os.dup2(os.open(os.devnull, os.O_RDWR), 0)
+        os.dup2(os.open(os.devnull, os.O_RDWR), 1)
+        with os.fdopen(write_fd, "w") as result_pipe:
+            result_pipe.write(json.dumps(_run(script)))
+        os._exit(0)
+    os.close(write_fd)
+    return pid, read_fd
+
+
+def _reap(child: _Child) -> dict:
+    """Wait for a child whose result pipe has closed and return its result."""
+    _, status = os.waitpid(child.pid, 0)
+    if child.chunks:
+        return json.loads(b"".join(child.chunks))
+    return {
+        "ok": False,
+        "error": f"test process exited with code {os.waitstatus_to_exitcode(status)}",
+        "timeout": False,
+    }
+
+
+def _respond(request_id: int, result: dict) -> None:
+    sys.stdout.write(json.dumps({"id": request_id, **result}) + "\n")
+    sys.stdout.flush()
+
+
+def _serve_forked() -> None:
+    """Fork a child per request and answer each one as its child finishes."""
+    stdin_fd = sys.stdin.fileno()
+    pending = b""
+    running: dict[int, _Child] = {}  # keyed by result-pipe read end
+    try:
+        while True:
+            deadline = min((c.deadline for c in running.values()), default=None)
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([stdin_fd, *running], [], [], wait)
+            for fd in readable:
+                if fd == stdin_fd:
+                    data = os.read(stdin_fd, 65536)
+                    if not data:
+                        return
+                    *lines, pending = (pending + data).split(b"\n")
+                    for line in lines:
+                        if not line.strip():
+                            continue
+                        job = json.loads(line)
+                        pid, read_fd = _fork(job["script"])
+                        running[read_fd] = _Child(
+                            job["id"], pid, time.monotonic() + job["timeout"]
+                        )
+                    continue
+                child = running[fd]
+                chunk = os.read(fd, 65536)
+                if chunk:
+                    child.chunks.append(chunk)
+                    continue
+                del running[fd]
+                os.close(fd)
+                _respond(child.request_id, _reap(child))
+
+            now = time.monotonic()
+            for fd, child in list(running.items()):
+                if child.deadline <= now:
+                    del running[fd]
+                    os.close(fd)
+                    os.kill(child.pid, signal.SIGKILL)
+                    os.waitpid(child.pid, 0)
+                    _respond(child.request_id, {"ok": False, "error": "", "timeout": True})
+    finally:
+        for fd, child in running.items():
+            os.close(fd)
+            os.kill(child.pid, signal.SIGKILL)
+            os.waitpid(child.pid, 0)
+
+
+def main() -> None:
+    sys.stdout.write(json.dumps({"ready": True}) + "\n")
+    sys.stdout.flush()
+    if hasattr(os, "fork"):
+        _serve_forked()
+        return
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        job = json.loads(line)
+        _respond(job["id"], _run(job["script"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,18 +22,20 @@ Options:
     -T timeout=1200              Timeout in seconds for test execution (default: 60)
     -T request_timeout=1200      HTTP timeout for agent requests (default: 1200)
     -T max_retries=1             Max retries on HTTP timeout (default: 1)
+    -T max_concurrency=8         Max in-flight requests to the A2A server (default: 8)
     -T with_plugin=False         Use plugin server and tag trial name (default: False)
 """
 
-from dotenv import load_dotenv
-load_dotenv()
-
+import asyncio
+import contextlib
 import json
 import logging
+import os
 import sys
 import textwrap
+from collections.abc import Iterator
 from pathlib import Path
-from uuid import uuid4
+from uuid import UUID
 
 # Ensure the project root is on sys.path so `eval.shared` can be imported
 _PROJECT_ROOT = str(Path(__file__).resolve().parent.parent.parent)
@@ -44,7 +46,7 @@ import httpx
 
 from inspect_ai import Task, task
 from inspect_ai.dataset import MemoryDataset
-from inspect_ai.model import ChatMessageAssistant, ModelOutput
+from inspect_ai.model import ModelOutput
 from inspect_ai.scorer import (
     Score,
     Target,
@@ -54,14 +56,19 @@ from inspect_ai.scorer import (
 from inspect_ai.solver import Generate, TaskState, solver
 
 from eval.shared import (
+    compile_template,
     extract_python_code,
     format_test_cases,
+    load_env,
     load_problems,
+    render_template,
     run_tests,
     sub_step_accuracy,
     test_pass_rate,
 )
 
+load_env()
+
 logger = logging.getLogger(__name__)
 
 # Port mapping: (model, with_plugin) → port
@@ -116,27 +123,61 @@ AGENT_PROMPT_TEMPLATE = textwrap.dedent("""\
     Include any necessary import statements inside the function body.
     DO NOT include any explanations, comments, or text outside the code block.
 """)
+_AGENT_PROMPT_PARTS = compile_template(AGENT_PROMPT_TEMPLATE)
 
 
-def _make_a2a_request(text: str) -> dict:
-    """Build a JSON-RPC 2.0 message/send request for the A2A server."""
-    return {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "message/send",
-        "params": {
-            "message": {
-                "role": "user",
-                "parts": [{"kind": "text", "text": text}],
-                "messageId": str(uuid4()),
-            },
+def _uuid_pool(batch: int = 1024) -> Iterator[UUID]:
+    """Yield random (version 4) UUIDs, drawing entropy in batches of *batch*."""
+    while True:
+        buf = os.urandom(16 * batch)
+        for i in range(0, len(buf), 16):
+            yield UUID(bytes=buf[i:i + 16], version=4)
+
+
+_message_ids = _uuid_pool()
+
+
+# JSON-RPC 2.0 message/send envelope, serialized once; the message ID and
+# prompt text are spliced into the placeholders per request.
+_A2A_REQUEST_TEMPLATE = json.dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "message/send",
+    "params": {
+        "message": {
+            "role": "user",
+            "parts": [{"kind": "text", "text": "__TEXT__"}],
+            "messageId": "__MESSAGE_ID__",
         },
-    }
+    },
+}).encode()
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _make_a2a_request(text: str) -> bytes:
+    """Build a serialized JSON-RPC 2.0 message/send request for the A2A server."""
+    # Splice the ID first so a placeholder inside *text* can never be replaced
+    body = _A2A_REQUEST_TEMPLATE.replace(
+        b'"__MESSAGE_ID__"', b'"%s"' % str(next(_message_ids)).encode(), 1
+    )
+    return body.replace(b'"__TEXT__"', json.dumps(text).encode(), 1)
+
+
+def _first_text(parts: list[dict] | None) -> str | None:
+    """Return the text of the first ``kind == "text"`` part, if any."""
+    for part in parts or ():
+        if part.get("kind") == "text":
+            return part.get("text")
+    return None
 
 
 def _extract_a2a_response(data: dict) -> tuple[str, dict]:
     """Extract text content and usage from an A2A JSON-RPC response.
 
+    The response is the first text part of the first non-usage artifact,
+    falling back to the task's status message.
+
     Returns:
         Tuple of (response_text, usage_dict).
     """
@@ -144,35 +185,27 @@ def _extract_a2a_response(data: dict) -> tuple[str, dict]:
         error = data["error"]
         raise RuntimeError(f"A2A server error: {error}")
 
-    result = data.get("result", {})
+    result = data.get("result") or {}
     response_text = ""
     usage = {}
 
-    # Check artifacts
-    artifacts = result.get("artifacts", [])
-    for artifact in artifacts:
-        name = artifact.get("name", "")
-        if name == "usage":
-            # Extract usage data from the usage artifact
-            for part in artifact.get("parts", []):
-                if part.get("kind") == "text":
-                    try:
-                        usage = json.loads(part["text"])
-                    except (json.JSONDecodeError, KeyError):
-                        pass
+    for artifact in result.get("artifacts") or ():
+        if artifact.get("name") == "usage":
+            usage_text = _first_text(artifact.get("parts"))
+            if usage_text is not None:
+                try:
+                    usage = json.loads(usage_text)
+                except json.JSONDecodeError:
+                    pass
         elif not response_text:
-            # First non-usage artifact is the response
-            for part in artifact.get("parts", []):
-                if part.get("kind") == "text":
-                    response_text = part["text"]
+            response_text = _first_text(artifact.get("parts")) or ""
+        if response_text and usage:
+            break
 
     # Fallback: check status message
     if not response_text:
-        status = result.get("status", {})
-        message = status.get("message", {})
-        for part in message.get("parts", []):
-            if part.get("kind") == "text":
-                response_text = part["text"]
+        message = (result.get("status") or {}).get("message") or {}
+        response_text = _first_text(message.get("parts")) or ""
 
     return response_text, usage
 
@@ -185,9 +218,46 @@ def a2a_agent_solver(
     request_timeout: int = 1200,
     max_retries: int = 1,
     with_plugin: bool = False,
+    max_concurrency: int = 8,
 ):
-    """Solver that sends problems to a Claude Code A2A server."""
+    """Solver that sends problems to a Claude Code A2A server.
+
+    Samples whose requests overlap share one ``httpx.AsyncClient``, so
+    connections to the server are kept alive between requests instead of
+    being re-established per sample. The first such request opens the client
+    and the last one to finish closes it, so the client (and the semaphore
+    capping requests in flight at *max_concurrency*) always belongs to the
+    running eval's event loop and is closed when the eval ends. The client's
+    connection pool is sized to match *max_concurrency*.
+    """
     model_name = "a2a-agent_plugin" if with_plugin else "a2a-agent"
+    client: httpx.AsyncClient | None = None
+    semaphore: asyncio.Semaphore | None = None
+    active = 0
+
+    @contextlib.asynccontextmanager
+    async def connection():
+        """Yield the shared client and semaphore, opening them if none are."""
+        nonlocal client, semaphore, active
+        if active == 0:
+            client = httpx.AsyncClient(
+                timeout=request_timeout,
+                limits=httpx.Limits(
+                    max_keepalive_connections=max_concurrency,
+                    max_connections=max_concurrency,
+                ),
+            )
+            semaphore = asyncio.Semaphore(max_concurrency)
+        active += 1
+        try:
+            yield client, semaphore
+        finally:
+            active -= 1
+            if active == 0:
+                # Detach before awaiting so a request starting meanwhile
+                # opens a new client rather than reusing this one
+                idle, client, semaphore = client, None, None
+                await idle.aclose()
 
     async def solve(state: TaskState, generate: Generate) -> TaskState:
         meta = state.metadata
@@ -203,14 +273,14 @@ def a2a_agent_solver(
             else ""
         )
 
-        prompt = AGENT_PROMPT_TEMPLATE.format(
-            dependencies=deps,
-            description=meta["description"],
-            background_section=background_section,
-            function_header=meta["function_header"],
-            docstring=meta["docstring"],
-            test_cases_section=test_cases_section,
-        )
+        prompt = render_template(_AGENT_PROMPT_PARTS, {
+            "dependencies": deps,
+            "description": meta["description"],
+            "background_section": background_section,
+            "function_header": meta["function_header"],
+            "docstring": meta["docstring"],
+            "test_cases_section": test_cases_section,
+        })
 
         logger.info(
             "Sending problem %s to A2A server at %s",
@@ -225,10 +295,12 @@ def a2a_agent_solver(
 
         for attempt in range(1, max_retries + 1):
             try:
-                async with httpx.AsyncClient(timeout=request_timeout) as client:
-                    resp = await client.post(agent_url, json=payload)
-                    resp.raise_for_status()
-                    data = resp.json()
+                async with connection() as (http, limit), limit:
+                    resp = await http.post(
+                        agent_url, content=payload, headers=_JSON_HEADERS
+                    )
+                resp.raise_for_status()
+                data = resp.json()
                 response_text, usage = _extract_a2a_response(data)
                 break
             except httpx.TimeoutException as exc:
@@ -288,7 +360,9 @@ def a2a_agent_solver(
         )
         state.metadata["incomplete"] = incomplete_reason
         state.metadata["usage"] = usage
-        state.messages.append(ChatMessageAssistant(content=response_text))
+        # Reuse the output's assistant message so the transcript (read by
+        # analysis/debug_evals.py) doesn't hold a second copy of the response
+        state.messages.append(state.output.message)
 
         return state
 
@@ -317,7 +391,7 @@ def agent_scorer(timeout: int = 1200):
         code = extract_python_code(response)
         test_cases = state.metadata["test_cases"]
 
-        passed, total, errors = run_tests(
+        passed, total, errors = await run_tests(
             code, test_cases, state.metadata["dependencies"], timeout
         )
         value = 1.0 if passed == total else 0.0
@@ -348,6 +422,7 @@ def starsim_agent_benchmark(
     request_timeout: int = 1200,
     max_retries: int = 1,
     with_plugin: bool = False,
+    max_concurrency: int = 8,
 ) -> Task:
     """Starsim agent coding evaluation benchmark.
 
@@ -367,6 +442,7 @@ def starsim_agent_benchmark(
         request_timeout: HTTP timeout in seconds for agent requests.
         max_retries: Max retries on HTTP timeout (default: 1).
         with_plugin: Use plugin server and tag trial name.
+        max_concurrency: Max requests in flight to the A2A server at once.
 
     Returns:
         An inspect_ai ``Task`` that drives the A2A agent over the problem set.
@@ -397,6 +473,7 @@ def starsim_agent_benchmark(
             request_timeout=request_timeout,
             max_retries=max_retries,
             with_plugin=with_plugin,
+            max_concurrency=max_concurrency,
         ),
         scorer=agent_scorer(timeout=timeout),
     )
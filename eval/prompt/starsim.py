@@ -18,11 +18,9 @@ Options:
     -T with_background=True      Include background context in prompts (default: True)
     -T with_test_cases=False     Include test cases in prompts (default: False)
     -T timeout=60                Timeout in seconds for test execution (default: 60)
+    -T cache=True                Reuse on-disk model responses for identical prompts (default: False)
 """
 
-from dotenv import load_dotenv
-load_dotenv()
-
 import sys
 import textwrap
 from pathlib import Path
@@ -34,6 +32,7 @@ if _PROJECT_ROOT not in sys.path:
 
 from inspect_ai import Task, task
 from inspect_ai.dataset import MemoryDataset
+from inspect_ai.model import CachePolicy
 from inspect_ai.scorer import (
     Score,
     Target,
@@ -43,14 +42,19 @@ from inspect_ai.scorer import (
 from inspect_ai.solver import Generate, TaskState, solver
 
 from eval.shared import (
+    compile_template,
     extract_python_code,
     format_test_cases,
+    load_env,
     load_problems,
+    render_template,
     run_tests,
     sub_step_accuracy,
     test_pass_rate,
 )
 
+load_env()
+
 
 PROMPT_TEMPLATE = textwrap.dedent("""\
     Write a Python function that solves the following Starsim problem.
@@ -75,10 +79,19 @@ PROMPT_TEMPLATE = textwrap.dedent("""\
     DO NOT include any explanations, comments, or text outside the code block.
     Include any necessary import statements inside the function body.
 """)
+_PROMPT_PARTS = compile_template(PROMPT_TEMPLATE)
 
 
 @solver
-def starsim_solver(with_background: bool = True, with_test_cases: bool = False):
+def starsim_solver(
+    with_background: bool = True,
+    with_test_cases: bool = False,
+    cache: bool = False,
+):
+    # inspect's response cache is keyed on model, messages, and generate
+    # config (temperature etc.); entries never expire so re-runs are free.
+    cache_policy = CachePolicy(expiry=None) if cache else False
+
     async def solve(state: TaskState, generate: Generate) -> TaskState:
         meta = state.metadata
         deps = ", ".join(meta["dependencies"])
@@ -91,16 +104,16 @@ def starsim_solver(with_background: bool = True, with_test_cases: bool = False):
             if with_test_cases
             else ""
         )
-        prompt = PROMPT_TEMPLATE.format(
-            dependencies=deps,
-            description=meta["description"],
-            background_section=background_section,
-            function_header=meta["function_header"],
-            docstring=meta["docstring"],
-            test_cases_section=test_cases_section,
-        )
+        prompt = render_template(_PROMPT_PARTS, {
+            "dependencies": deps,
+            "description": meta["description"],
+            "background_section": background_section,
+            "function_header": meta["function_header"],
+            "docstring": meta["docstring"],
+            "test_cases_section": test_cases_section,
+        })
         state.user_prompt.text = prompt
-        return await generate(state)
+        return await generate(state, cache=cache_policy)
 
     return solve
 
@@ -112,7 +125,7 @@ def starsim_scorer(timeout: int = 60):
         code = extract_python_code(response)
         test_cases = state.metadata["test_cases"]
 
-        passed, total, errors = run_tests(
+        passed, total, errors = await run_tests(
             code, test_cases, state.metadata["dependencies"], timeout
         )
         value = 1.0 if passed == total else 0.0
@@ -138,6 +151,7 @@ def starsim_benchmark(
     with_background: bool = True,
     with_test_cases: bool = False,
     timeout: int = 60,
+    cache: bool = False,
 ) -> Task:
     """Starsim coding evaluation benchmark.
 
@@ -150,6 +164,8 @@ def starsim_benchmark(
         with_background: Whether to include background context in prompts.
         with_test_cases: Whether to include test cases in prompts.
         timeout: Timeout in seconds for each test case execution.
+        cache: Reuse stored model responses for byte-identical prompts
+            (inspect's on-disk cache), so re-runs skip the model call.
 
     Returns:
         An inspect_ai ``Task`` pairing the problem dataset with the Starsim
@@ -182,6 +198,10 @@ def starsim_benchmark(
 
     return Task(
         dataset=dataset,
-        solver=starsim_solver(with_background=with_background, with_test_cases=with_test_cases),
+        solver=starsim_solver(
+            with_background=with_background,
+            with_test_cases=with_test_cases,
+            cache=cache,
+        ),
         scorer=starsim_scorer(timeout=timeout),
     )
@@ -3,12 +3,35 @@
 Used by both the LLM (one-shot) and agent-based evaluations.
 """
 
-import json
-import subprocess
+import ast
+import asyncio
+import functools
+import itertools
+import os
+import re
+import string
 import sys
-import tempfile
+import weakref
 from pathlib import Path
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    # The stdlib parser also accepts bytes; encode so _dumps returns bytes
+    # whichever module is installed.
+    import json
+
+    _loads = json.loads
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+from dotenv import load_dotenv
 from inspect_ai.dataset import Sample
 from inspect_ai.scorer import (
     Metric,
@@ -17,21 +40,34 @@ from inspect_ai.scorer import (
 )
 
 
+# Last ```python block (an unterminated one runs to the end of the response),
+# falling back to the last fenced block of any kind.
+_PYTHON_BLOCK_RE = re.compile(r"```python(.*?)(?:```|\Z)", re.DOTALL)
+_ANY_BLOCK_RE = re.compile(r"```(.*?)```", re.DOTALL)
+
+
 def extract_python_code(response: str) -> str:
     """Extract Python code from a markdown code block."""
-    # Find the last ```python ... ``` block
-    parts = response.split("```python")
-    if len(parts) < 2:
-        # Try without language specifier
-        parts = response.split("```")
-        if len(parts) < 3:
-            return response
-        code = parts[-2]
-    else:
-        code = parts[-1]
-    # Remove trailing ```
-    code = code.split("```")[0]
-    return code.strip()
+    blocks = _PYTHON_BLOCK_RE.findall(response) or _ANY_BLOCK_RE.findall(response)
+    if not blocks:
+        return response
+    return blocks[-1].strip()
+
+
+@functools.cache
+def load_env() -> None:
+    """Load ``.env`` into the environment, once per process.
+
+    Cached here rather than in the task modules because inspect may execute a
+    task file more than once while enumerating tasks.
+    """
+    load_dotenv()
+
+
+def _parse_jsonl(path: Path) -> list[dict]:
+    """Parse a JSONL file in one call by joining its lines into a JSON array."""
+    lines = path.read_bytes().split(b"\n")
+    return _loads(b"[" + b",".join(line for line in lines if line.strip()) + b"]")
 
 
 def load_problems(problems_dir: str, tutorial: str | None = None) -> list[Sample]:
@@ -62,23 +98,33 @@ def load_problems(problems_dir: str, tutorial: str | None = None) -> list[Sample
         [`run_tests`][eval.shared.run_tests]: scores a solution against a
         sample's ``test_cases`` metadata.
     """
-    problems_path = Path(problems_dir)
-    samples = []
-    for jsonl_file in sorted(problems_path.glob("starsim_t*.jsonl")):
-        with open(jsonl_file) as f:
-            for line in f:
-                record = json.loads(line)
-                if tutorial and record["problem_id"] != tutorial:
-                    continue
-                samples.append(
-                    Sample(
-                        input="placeholder",
-                        target=record["sub_step_id"],
-                        id=record["sub_step_id"],
-                        metadata=record,
-                    )
-                )
-    return samples
+    return [
+        Sample(
+            input="placeholder",
+            target=record["sub_step_id"],
+            id=record["sub_step_id"],
+            metadata=dict(record),
+        )
+        for record in _load_records(Path(problems_dir))
+        if not tutorial or record["problem_id"] == tutorial
+    ]
+
+
+# Parsed records per problems directory, keyed by its realpath and tagged
+# with the (file name, mtime_ns) fingerprint they were parsed from.
+_RECORDS_CACHE: dict[str, tuple[tuple[tuple[str, int], ...], list[dict]]] = {}
+
+
+def _load_records(problems_path: Path) -> list[dict]:
+    """Return every record in *problems_path*, re-parsing only when a file changes."""
+    jsonl_files = sorted(problems_path.glob("starsim_t*.jsonl"))
+    fingerprint = tuple((p.name, p.stat().st_mtime_ns) for p in jsonl_files)
+    key = os.path.realpath(problems_path)
+    cached = _RECORDS_CACHE.get(key)
+    if cached is None or cached[0] != fingerprint:
+        records = [record for path in jsonl_files for record in _parse_jsonl(path)]
+        cached = _RECORDS_CACHE[key] = (fingerprint, records)
+    return cached[1]
 
 
 _DEPENDENCY_IMPORTS = {
@@ -89,11 +135,181 @@ _DEPENDENCY_IMPORTS = {
 
 def make_preamble(dependencies: list[str]) -> str:
     """Generate import statements for the given dependencies."""
+    return _preamble_for(tuple(dependencies))
+
+
+@functools.lru_cache(maxsize=64)
+def _preamble_for(dependencies: tuple[str, ...]) -> str:
+    """Cached body of ``make_preamble``; problems share a few dependency lists."""
     lines = [_DEPENDENCY_IMPORTS[dep] for dep in dependencies if dep in _DEPENDENCY_IMPORTS]
     return "\n".join(lines)
 
 
-def run_tests(
+# Upper bound on test cases running (forked children in flight) at once,
+# across all samples being scored.
+_MAX_PARALLEL_TESTS = os.cpu_count() or 1
+
+_WORKER_SCRIPT = Path(__file__).resolve().parent / "_test_worker.py"
+_WORKER_GRACE_SECONDS = 10
+
+
+class _TestWorker:
+    """A persistent ``_test_worker.py`` subprocess that runs tests concurrently.
+
+    The worker forks a child per request, so requests sent together run in
+    parallel; responses are matched back to their requests by ``id``.
+    """
+
+    def __init__(self, proc: asyncio.subprocess.Process):
+        self.proc = proc
+        self.closed = False
+        self._ids = itertools.count()
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader = asyncio.create_task(self._read_responses())
+
+    @classmethod
+    async def start(cls) -> "_TestWorker":
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable,
+            str(_WORKER_SCRIPT),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        # Wait for the preload imports so they don't count against a test's timeout
+        if not await proc.stdout.readline():
+            raise EOFError(f"test worker exited with code {await proc.wait()}")
+        return cls(proc)
+
+    async def _read_responses(self) -> None:
+        """Resolve pending requests as responses arrive; fail them all on exit."""
+        while line := await self.proc.stdout.readline():
+            response = _loads(line)
+            future = self._pending.get(response["id"])
+            if future is not None and not future.done():
+                future.set_result(response)
+        self.closed = True
+        exc = EOFError(f"test worker exited with code {await self.proc.wait()}")
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(exc)
+
+    async def run(self, script: str, timeout: int) -> dict:
+        """Have the worker run *script* in a forked child with a *timeout*.
+
+        The worker enforces *timeout* itself; the extra grace period here
+        only catches a worker that has stopped responding.
+
+        Raises:
+            TimeoutError: The worker did not answer in time.
+            EOFError: The worker died while running the test.
+        """
+        if self.closed:
+            raise EOFError("test worker has exited")
+        request_id = next(self._ids)
+        future = self._pending[request_id] = asyncio.get_running_loop().create_future()
+        try:
+            self.proc.stdin.write(
+                _dumps({"id": request_id, "script": script, "timeout": timeout}) + b"\n"
+            )
+            await self.proc.stdin.drain()
+            return await asyncio.wait_for(future, timeout + _WORKER_GRACE_SECONDS)
+        finally:
+            del self._pending[request_id]
+
+    async def kill(self) -> None:
+        self.closed = True
+        if self.proc.returncode is None:
+            self.proc.kill()
+        await self.proc.wait()
+
+
+class _TestRunner:
+    """The shared test worker plus the test-case concurrency cap for one event loop."""
+
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(_MAX_PARALLEL_TESTS)
+        self._worker: _TestWorker | None = None
+        self._starting = asyncio.Lock()
+
+    async def worker(self) -> _TestWorker:
+        """Return the running worker, starting a new one if there is none."""
+        async with self._starting:
+            if self._worker is None or self._worker.closed:
+                self._worker = await _TestWorker.start()
+            return self._worker
+
+
+# One runner per event loop (asyncio subprocesses and semaphores cannot cross
+# loops). Sharing it between concurrent run_tests calls keeps the total number
+# of running tests at _MAX_PARALLEL_TESTS rather than that many per sample,
+# all forked from a single preloaded interpreter.
+_RUNNERS: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, _TestRunner
+] = weakref.WeakKeyDictionary()
+
+
+def _get_runner() -> _TestRunner:
+    loop = asyncio.get_running_loop()
+    runner = _RUNNERS.get(loop)
+    if runner is None:
+        runner = _RUNNERS[loop] = _TestRunner()
+    return runner
+
+
+class TestWorkerError(RuntimeError):
+    """The test worker failed, so some test cases could not be run at all."""
+
+    __test__ = False  # not a pytest test class
+
+
+async def _run_test_case(script: str, description: str, timeout: int) -> str | None:
+    """Run one test script on the shared worker.
+
+    A worker that stops responding is killed, which also ends the other
+    tests running on it; those (like a test whose worker died) are retried
+    once on a fresh worker.
+
+    Returns:
+        ``None`` if the script ran cleanly, otherwise a failure/timeout
+        message. Failures of the worker itself (as opposed to the test) are
+        prefixed ``ERROR`` rather than ``FAIL``.
+    """
+    runner = _get_runner()
+    async with runner.semaphore:
+        for _attempt in range(2):
+            try:
+                worker = await runner.worker()
+            except EOFError as exc:
+                failure = exc
+                continue
+            try:
+                result = await worker.run(script, timeout)
+            except TimeoutError:
+                await worker.kill()
+                return f"TIMEOUT [{description}]"
+            except (EOFError, ConnectionError) as exc:
+                await worker.kill()
+                failure = exc
+                continue
+            break
+        else:
+            return f"ERROR [{description}]: {failure}"
+
+        if result["timeout"]:
+            return f"TIMEOUT [{description}]"
+        if not result["ok"]:
+            return f"FAIL [{description}]: {result['error'][-500:]}"
+        return None
+
+
+# Results of recent run_tests calls, keyed by everything that determines
+# them, so identical completions within a run are only executed once.
+_RESULTS_CACHE: dict[tuple, tuple[int, int, tuple[str, ...]]] = {}
+_RESULTS_CACHE_SIZE = 1024
+
+
+async def run_tests(
     code: str,
     test_cases: list[dict],
     dependencies: list[str],
@@ -102,8 +318,16 @@ def run_tests(
     """Run test cases against generated code.
 
     Each test case is concatenated with a dependency import preamble and the
-    candidate *code*, then executed in its own subprocess. A case passes if the
-    subprocess exits cleanly within *timeout* seconds.
+    candidate *code*, then executed in its own process, forked from a single
+    persistent worker (``eval/_test_worker.py``) that has already imported
+    ``starsim`` and ``numpy``. A case passes if the script runs without
+    raising within *timeout* seconds. Test cases run concurrently, with at
+    most one per CPU running across all concurrent ``run_tests`` calls, and
+    errors are reported in test-case order.
+
+    Code that does not parse fails every case without running any of them,
+    and results are reused for repeated calls with the same arguments
+    (except when a case timed out, which may depend on machine load).
 
     Args:
         code: The candidate solution (typically a single function definition).
@@ -117,17 +341,23 @@ def run_tests(
         A ``(passed, total, errors)`` tuple: the number of cases that passed,
         the total number of cases, and a list of failure/timeout messages.
 
+    Raises:
+        TestWorkerError: A test case could not be run because the test
+            worker failed, even after a retry on a fresh worker. The sample
+            then errors in inspect instead of being scored.
+
     Example:
         ```python
+        import asyncio
         from eval.shared import load_problems, run_tests
 
         problem = load_problems("./problems", tutorial="starsim_t1")[0].metadata
-        passed, total, errors = run_tests(
+        passed, total, errors = asyncio.run(run_tests(
             code=problem["gold_solution"],
             test_cases=problem["test_cases"],
             dependencies=problem["dependencies"],
             timeout=60,
-        )
+        ))
         assert passed == total, errors
         ```
 
@@ -135,37 +365,61 @@ def run_tests(
         [`load_problems`][eval.shared.load_problems]: supplies the test cases
         and dependencies for a problem.
     """
-    preamble = make_preamble(dependencies)
-    passed = 0
     total = len(test_cases)
-    errors = []
-
-    for tc in test_cases:
-        script = f"{preamble}\n\n{code}\n\n{tc['test']}\n"
-        with tempfile.NamedTemporaryFile(
-            mode="w", suffix=".py", delete=False
-        ) as tmp:
-            tmp.write(script)
-            tmp.flush()
-            try:
-                subprocess.run(
-                    [sys.executable, tmp.name],
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout,
-                    check=True,
-                )
-                passed += 1
-            except subprocess.CalledProcessError as e:
-                errors.append(
-                    f"FAIL [{tc['description']}]: {e.stderr[-500:] if e.stderr else ''}"
-                )
-            except subprocess.TimeoutExpired:
-                errors.append(f"TIMEOUT [{tc['description']}]")
-            finally:
-                Path(tmp.name).unlink(missing_ok=True)
-
-    return passed, total, errors
+    try:
+        ast.parse(code)
+    except SyntaxError as exc:
+        return 0, total, [f"SYNTAX ERROR: {exc}"]
+
+    key = (
+        code,
+        tuple((tc["test"], tc["description"]) for tc in test_cases),
+        tuple(dependencies),
+        timeout,
+    )
+    cached = _RESULTS_CACHE.get(key)
+    if cached is not None:
+        passed, total, errors = cached
+        return passed, total, list(errors)
+
+    header = f"{make_preamble(dependencies)}\n\n{code}\n\n"
+    results = await asyncio.gather(*(
+        _run_test_case(header + tc["test"] + "\n", tc["description"], timeout)
+        for tc in test_cases
+    ))
+    errors = [err for err in results if err is not None]
+    worker_errors = [err for err in errors if err.startswith("ERROR")]
+    if worker_errors:
+        # Not the code's fault: fail the sample rather than score it
+        raise TestWorkerError("\n".join(worker_errors))
+    # Timeouts may depend on machine load rather than the code
+    if not any(err.startswith("TIMEOUT") for err in errors):
+        if len(_RESULTS_CACHE) >= _RESULTS_CACHE_SIZE:
+            del _RESULTS_CACHE[next(iter(_RESULTS_CACHE))]
+        _RESULTS_CACHE[key] = (total - len(errors), total, tuple(errors))
+    return total - len(errors), total, errors
+
+
+def compile_template(template: str) -> tuple[tuple[str, str | None], ...]:
+    """Pre-split a ``str.format`` template into ``(literal, field_name)`` pairs.
+
+    Only plain ``{name}`` fields are supported; the result is rendered with
+    [`render_template`][eval.shared.render_template].
+    """
+    parts = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if spec or conversion:
+            raise ValueError(f"Unsupported format spec in template field {field!r}")
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+def render_template(parts: tuple[tuple[str, str | None], ...], fields: dict[str, str]) -> str:
+    """Render a template compiled by ``compile_template`` from *fields*."""
+    return "".join(
+        literal if field is None else literal + fields[field]
+        for literal, field in parts
+    )
 
 
 def format_test_cases(test_cases: list[dict]) -> str:
@@ -1,10 +1,16 @@
 """Streamlit app to browse the Starsim AI evaluation dataset."""
 
-import json
+import mmap
+import os
 from pathlib import Path
 
 import streamlit as st
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # fall back to the stdlib parser, which also accepts bytes
+    from json import loads as _loads
+
 PROBLEMS_DIR = Path(__file__).parent
 
 PROBLEM_LABELS = {
@@ -14,28 +20,104 @@ PROBLEM_LABELS = {
 }
 
 
-@st.cache_data
-def load_problems() -> list[dict]:
-    """Load all problems from JSONL files."""
+def _parse_jsonl(path: Path) -> list[dict]:
+    """Parse a JSONL file by scanning a read-only memory map for newlines.
+
+    Each record is sliced straight out of the page cache and handed to the
+    parser as bytes, skipping the whole-file decode to ``str``.
+    """
+    records = []
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return records  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            end = len(mm)
+            while start < end:
+                nl = mm.find(b"\n", start)
+                if nl == -1:
+                    nl = end
+                line = mm[start:nl]
+                if line.strip():
+                    records.append(_loads(line))
+                start = nl + 1
+    return records
+
+
+def _problems_fingerprint() -> tuple[tuple[str, int], ...]:
+    """Return ``(file name, mtime_ns)`` pairs for every problem JSONL file."""
+    return tuple(
+        (p.name, p.stat().st_mtime_ns) for p in sorted(PROBLEMS_DIR.glob("*.jsonl"))
+    )
+
+
+@st.cache_data(persist="disk", show_spinner=False)
+def load_problems(fingerprint: tuple[tuple[str, int], ...]) -> list[dict]:
+    """Load all problems from JSONL files.
+
+    *fingerprint* (from ``_problems_fingerprint``) is the cache key, so the
+    on-disk cache is invalidated whenever a JSONL file is regenerated.
+    """
     problems = []
-    for path in sorted(PROBLEMS_DIR.glob("*.jsonl")):
-        for line in path.read_text().splitlines():
-            if line.strip():
-                problems.append(json.loads(line))
+    for name, _mtime in fingerprint:
+        problems.extend(_parse_jsonl(PROBLEMS_DIR / name))
     return problems
 
 
+@st.cache_resource(show_spinner=False)
+def group_problems(fingerprint: tuple[tuple[str, int], ...]) -> dict[str, list[dict]]:
+    """Group the loaded problems by ``problem_id``, preserving file order.
+
+    Cached on the same *fingerprint* as ``load_problems``. A resource cache
+    hands every rerun the same object instead of unpickling a fresh copy, so
+    callers must treat the result as read-only.
+    """
+    grouped: dict[str, list[dict]] = {}
+    for p in load_problems(fingerprint):
+        grouped.setdefault(p["problem_id"], []).append(p)
+    return grouped
+
+
+@st.cache_resource(show_spinner=False)
+def sub_step_labels(fingerprint: tuple[tuple[str, int], ...], problem_id: str) -> list[str]:
+    """Return the sidebar label for each sub-step of *problem_id*, in order.
+
+    Shared across reruns like ``group_problems``; do not mutate the list.
+    """
+    return [
+        f"{p['sub_step_id']}: {p['description'][:60]}…"
+        for p in group_problems(fingerprint)[problem_id]
+    ]
+
+
+@st.fragment
+def render_test_cases(sub: dict) -> None:
+    """Render the sub-step's test cases as expanders."""
+    st.markdown("### Test Cases")
+    for i, tc in enumerate(sub["test_cases"], 1):
+        with st.expander(f"Test {i}: {tc['description']}"):
+            st.code(tc["test"], language="python")
+
+
+@st.fragment
+def render_gold_solution(sub: dict) -> None:
+    """Render the gold solution if the sidebar's "Show gold solution" is checked.
+
+    Fragments cannot write to the sidebar, so the checkbox is created in
+    ``main()`` and its value read here from ``st.session_state``.
+    """
+    if st.session_state.get("show_solution", False):
+        st.markdown("### Gold Solution")
+        st.code(sub["gold_solution"], language="python")
+
+
 def main():
     """Launch the Streamlit app for browsing the Starsim evaluation dataset."""
     st.set_page_config(page_title="Starsim Eval Browser", layout="wide")
     st.title("Starsim AI Evaluation Dataset")
 
-    problems = load_problems()
-
-    # Group by problem_id
-    grouped: dict[str, list[dict]] = {}
-    for p in problems:
-        grouped.setdefault(p["problem_id"], []).append(p)
+    fingerprint = _problems_fingerprint()
+    grouped = group_problems(fingerprint)
 
     # Sidebar — select main problem
     problem_ids = list(grouped.keys())
@@ -47,14 +129,12 @@ def main():
 
     sub_problems = grouped[selected_id]
 
-    # Sidebar — select sub-step
-    selected_sub = st.sidebar.selectbox(
-        "Sub-step",
-        sub_problems,
-        format_func=lambda p: f"{p['sub_step_id']}: {p['description'][:60]}…",
-    )
+    # Sidebar — select sub-step (options are plain strings; map back by index)
+    labels = sub_step_labels(fingerprint, selected_id)
+    selected_label = st.sidebar.selectbox("Sub-step", labels)
+    selected_sub = sub_problems[labels.index(selected_label)]
 
-    show_solution = st.sidebar.checkbox("Show gold solution", value=False)
+    st.sidebar.checkbox("Show gold solution", value=False, key="show_solution")
 
     # Main content
     st.header(PROBLEM_LABELS.get(selected_id, selected_id))
@@ -76,14 +156,8 @@ def main():
     st.markdown("### Dependencies")
     st.write(", ".join(f"`{d}`" for d in selected_sub["dependencies"]))
 
-    st.markdown("### Test Cases")
-    for i, tc in enumerate(selected_sub["test_cases"], 1):
-        with st.expander(f"Test {i}: {tc['description']}"):
-            st.code(tc["test"], language="python")
-
-    if show_solution:
-        st.markdown("### Gold Solution")
-        st.code(selected_sub["gold_solution"], language="python")
+    render_test_cases(selected_sub)
+    render_gold_solution(selected_sub)
 
 
 if __name__ == "__main__":
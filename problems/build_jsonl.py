@@ -4,21 +4,42 @@
 Usage:
     python problems/build_jsonl.py              # convert all .md files in problems/
     python problems/build_jsonl.py starsim_t1   # convert a single tutorial
+    python problems/build_jsonl.py --jobs 4     # convert files in 4 worker processes
 """
 
+import argparse
 import json
+import os
 import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    # Same bytes orjson produces for these records (compact, UTF-8), so the
+    # generated files don't depend on which encoder is installed.
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
 PROBLEMS_DIR = Path(__file__).parent
 
+_SUB_STEP_RE = re.compile(r"^## ", re.MULTILINE)
+_SECTION_RE = re.compile(r"^### (.+)$", re.MULTILINE)
+_TEST_CASE_RE = re.compile(r"^#### (.+)$", re.MULTILINE)
+_CODE_BLOCK_RE = re.compile(r"```\w*\n(.*?)```", re.DOTALL)
+_DEPENDENCY_RE = re.compile(r"^- (.+)$", re.MULTILINE)
+
 
 def parse_markdown(text: str) -> list[dict]:
     """Parse a tutorial markdown file into a list of problem dicts."""
     problems = []
     # Split into sub-step sections (## headings)
-    sub_step_chunks = re.split(r"^## ", text, flags=re.MULTILINE)
+    sub_step_chunks = _SUB_STEP_RE.split(text)
 
     # First chunk is the file-level header (# heading); skip it
     for chunk in sub_step_chunks[1:]:
@@ -56,7 +77,7 @@ def _parse_sub_step(chunk: str) -> dict:
 def _extract_sections(chunk: str) -> dict[str, str]:
     """Split a sub-step chunk into named sections by ### headings."""
     sections = {}
-    parts = re.split(r"^### (.+)$", chunk, flags=re.MULTILINE)
+    parts = _SECTION_RE.split(chunk)
     # parts[0] is text before first ###, parts[1] is heading, parts[2] is body, etc.
     for i in range(1, len(parts), 2):
         heading = parts[i].strip()
@@ -67,26 +88,26 @@ def _extract_sections(chunk: str) -> dict[str, str]:
 
 def _extract_code_block(text: str) -> str:
     """Extract the content of the first fenced code block."""
-    match = re.search(r"```\w*\n(.*?)```", text, re.DOTALL)
+    match = _CODE_BLOCK_RE.search(text)
     return match.group(1).rstrip("\n") if match else text.strip()
 
 
 def _extract_raw_block(text: str) -> str:
     """Extract the content of a fenced code block, preserving internal whitespace."""
-    match = re.search(r"```\w*\n(.*?)```", text, re.DOTALL)
+    match = _CODE_BLOCK_RE.search(text)
     return match.group(1).rstrip("\n") if match else text.strip()
 
 
 def _parse_dependencies(text: str) -> list[str]:
     """Parse a markdown list of dependencies."""
-    deps = re.findall(r"^- (.+)$", text.strip(), re.MULTILINE)
+    deps = _DEPENDENCY_RE.findall(text.strip())
     return [d.strip() for d in deps] if deps else []
 
 
 def _parse_test_cases(text: str) -> list[dict]:
     """Parse test cases from #### headings with code blocks."""
     test_cases = []
-    parts = re.split(r"^#### (.+)$", text, flags=re.MULTILINE)
+    parts = _TEST_CASE_RE.split(text)
     for i in range(1, len(parts), 2):
         description = parts[i].strip()
         body = parts[i + 1] if i + 1 < len(parts) else ""
@@ -95,39 +116,83 @@ def _parse_test_cases(text: str) -> list[dict]:
     return test_cases
 
 
+def to_jsonl(problems: list[dict]) -> bytes:
+    """Serialize problem dicts to JSONL bytes, one compact record per line."""
+    return b"".join(_dumps(problem) + b"\n" for problem in problems)
+
+
 def convert_file(md_path: Path) -> Path:
     """Convert a single markdown file to JSONL."""
     text = md_path.read_text()
     problems = parse_markdown(text)
 
     jsonl_path = md_path.with_suffix(".jsonl")
-    with open(jsonl_path, "w") as f:
-        for problem in problems:
-            f.write(json.dumps(problem) + "\n")
+    data = to_jsonl(problems)
+    # Leave an up-to-date file untouched so its mtime (which the loaders'
+    # caches key on) only changes when the content does.
+    if jsonl_path.exists() and jsonl_path.read_bytes() == data:
+        print(f"  {md_path.name} -> {jsonl_path.name} (unchanged)")
+        return jsonl_path
+
+    tmp_path = jsonl_path.with_suffix(".jsonl.tmp")
+    tmp_path.write_bytes(data)
+    tmp_path.replace(jsonl_path)
 
     print(f"  {md_path.name} -> {jsonl_path.name} ({len(problems)} problems)")
     return jsonl_path
 
 
 def main():
-    if len(sys.argv) > 1:
-        names = sys.argv[1:]
+    parser = argparse.ArgumentParser(description="Convert markdown problem files to JSONL.")
+    parser.add_argument(
+        "names",
+        nargs="*",
+        help="Tutorial names to convert (default: every .md file except README)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes; files are independent (default: 1)",
+    )
+    args = parser.parse_args()
+
+    if args.names:
+        names = args.names
     else:
-        names = sorted(
-            p.stem for p in PROBLEMS_DIR.glob("*.md") if p.stem != "README"
-        )
+        # One directory read; the entries already know whether they are files
+        with os.scandir(PROBLEMS_DIR) as entries:
+            names = sorted(
+                entry.name[:-3]
+                for entry in entries
+                if entry.name.endswith(".md")
+                and entry.name != "README.md"
+                and entry.is_file()
+            )
 
     if not names:
         print("No markdown files found in", PROBLEMS_DIR)
         sys.exit(1)
 
     print(f"Building JSONL from {len(names)} markdown file(s):")
+    md_paths = []
     for name in names:
         md_path = PROBLEMS_DIR / f"{name}.md"
-        if not md_path.exists():
+        # Listed files are known to exist; only check names given by the user
+        if args.names and not md_path.is_file():
             print(f"  WARNING: {md_path} not found, skipping")
             continue
-        convert_file(md_path)
+        md_paths.append(md_path)
+
+    # A process pool only pays off for many/large files; the checked-in set
+    # converts faster than a pool starts, hence the sequential default.
+    if args.jobs > 1 and len(md_paths) > 1:
+        with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+            list(pool.map(convert_file, md_paths))
+    else:
+        for md_path in md_paths:
+            convert_file(md_path)
 
     print("Done.")
 
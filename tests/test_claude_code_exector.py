@@ -47,17 +47,21 @@ def claude_code_server():
         stderr=subprocess.STDOUT,
     )
 
-    # Wait until the server accepts connections
+    # Wait until the server accepts connections, polling quickly at first
     deadline = time.time() + STARTUP_TIMEOUT
     ready = False
-    while time.time() < deadline:
-        try:
-            resp = httpx.get(f"{BASE_URL}/.well-known/agent.json", timeout=2)
-            if resp.status_code == 200:
-                ready = True
-                break
-        except httpx.ConnectError:
-            time.sleep(0.5)
+    delay = 0.01
+    with httpx.Client(timeout=2) as probe:
+        while time.time() < deadline:
+            try:
+                resp = probe.get(f"{BASE_URL}/.well-known/agent.json")
+                if resp.status_code == 200:
+                    ready = True
+                    break
+            except httpx.ConnectError:
+                pass
+            time.sleep(delay)
+            delay = min(delay * 1.5, 0.25)
 
     if not ready:
         proc.terminate()
@@ -70,6 +74,13 @@ def claude_code_server():
     proc.wait()
 
 
+@pytest.fixture(scope="module")
+def http_client(claude_code_server):
+    """One keep-alive client (and connection pool) shared by all tests."""
+    with httpx.Client(base_url=BASE_URL, timeout=REQUEST_TIMEOUT) as client:
+        yield client
+
+
 def make_request(method: str, params: dict, req_id: int = 1) -> dict:
     return {
         "jsonrpc": JSONRPC_VERSION,
@@ -98,11 +109,10 @@ def make_message(text: str, task_id: str | None = None, context_id: str | None =
 # 1. Discover the Agent Card
 # ---------------------------------------------------------------------------
 
-def test_discover_agent(claude_code_server):
-    with httpx.Client() as client:
-        resp = client.get(f"{BASE_URL}/.well-known/agent.json")
-        resp.raise_for_status()
-        card = resp.json()
+def test_discover_agent(http_client):
+    resp = http_client.get("/.well-known/agent.json")
+    resp.raise_for_status()
+    card = resp.json()
 
     assert "name" in card
     assert "version" in card
@@ -112,16 +122,15 @@ def test_discover_agent(claude_code_server):
 # 2. One-shot message/send
 # ---------------------------------------------------------------------------
 
-def test_send(claude_code_server):
+def test_send(http_client):
     payload = make_request(
         "message/send",
         make_message("Write a Python function that checks if a number is prime. Keep it short."),
     )
 
-    with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
-        resp = client.post(BASE_URL, json=payload)
-        resp.raise_for_status()
-        data = resp.json()
+    resp = http_client.post("/", json=payload)
+    resp.raise_for_status()
+    data = resp.json()
 
     assert "error" not in data, f"JSON-RPC error: {data.get('error')}"
 
@@ -135,22 +144,21 @@ def test_send(claude_code_server):
 
 
 @pytest.mark.skip(reason="not working")
-def test_stream(claude_code_server):
+def test_stream(http_client):
     payload = make_request(
         "message/sendStream",
         make_message("List 3 creative project ideas for a weekend hackathon. Be brief."),
     )
 
     events = []
-    with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
-        with connect_sse(client, "POST", BASE_URL, json=payload) as event_source:
-            event_source.response.raise_for_status()
-            for sse in event_source.iter_sse():
-                try:
-                    event = json.loads(sse.data)
-                    events.append(event)
-                except json.JSONDecodeError:
-                    pass
+    with connect_sse(http_client, "POST", "/", json=payload) as event_source:
+        event_source.response.raise_for_status()
+        for sse in event_source.iter_sse():
+            try:
+                event = json.loads(sse.data)
+                events.append(event)
+            except json.JSONDecodeError:
+                pass
 
     assert len(events) > 0, "Expected at least one SSE event"
 
@@ -159,7 +167,7 @@ def test_stream(claude_code_server):
 # 4. Multi-turn conversation
 # ---------------------------------------------------------------------------
 
-def test_multi_turn(claude_code_server):
+def test_multi_turn(http_client):
     # Turn 1: Initial request
     payload1 = make_request(
         "message/send",
@@ -167,9 +175,8 @@ def test_multi_turn(claude_code_server):
         req_id=1,
     )
 
-    with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
-        resp1 = client.post(BASE_URL, json=payload1)
-        data1 = resp1.json()
+    resp1 = http_client.post("/", json=payload1)
+    data1 = resp1.json()
 
     result1 = data1.get("result", {})
     task_id = result1.get("id")
@@ -188,8 +195,7 @@ def test_multi_turn(claude_code_server):
         req_id=2,
     )
 
-    with httpx.Client(timeout=REQUEST_TIMEOUT) as client:
-        resp2 = client.post(BASE_URL, json=payload2)
-        data2 = resp2.json()
+    resp2 = http_client.post("/", json=payload2)
+    data2 = resp2.json()
 
     assert "error" not in data2, f"JSON-RPC error on turn 2: {data2.get('error')}"
@@ -8,30 +8,47 @@ Usage:
 
 from __future__ import annotations
 
-import json
+import operator
 import subprocess
 import sys
-import tempfile
 from pathlib import Path
 
 import pytest
 
+try:
+    from orjson import loads as _loads
+except ImportError:  # stdlib json.loads reads the same lines
+    from json import loads as _loads
+
+# Nearly all of this module's run time is the Starsim simulations the gold
+# solutions and test cases run; the rest is JSONL parsing and exec. There is no
+# numeric Python loop for a JIT (Numba, PyPy) to speed up -- parallelize with
+# pytest-xdist instead (see tests/README.md).
+
 PROBLEMS_DIR = Path(__file__).resolve().parent.parent / "problems"
 
+# "<file>:<line>" each loaded sub-step came from, keyed by id() of its dict
+SOURCES: dict[int, str] = {}
+
 
 def load_substeps() -> list[dict]:
-    """Load all sub-steps from every JSONL file in the problems directory."""
+    """Load all sub-steps from every JSONL file in the problems directory.
+
+    The sub-step dicts are left exactly as parsed; their locations are
+    recorded in ``SOURCES``.
+    """
     substeps = []
     for path in sorted(PROBLEMS_DIR.glob("*.jsonl")):
-        with open(path) as f:
-            for line_num, line in enumerate(f, 1):
-                step = json.loads(line)
-                step["_source"] = f"{path.name}:{line_num}"
-                substeps.append(step)
+        for line_num, line in enumerate(path.read_bytes().splitlines(), 1):
+            if not line.strip():
+                continue
+            step = _loads(line)
+            SOURCES[id(step)] = f"{path.name}:{line_num}"
+            substeps.append(step)
     return substeps
 
 
-REQUIRED_FIELDS = [
+REQUIRED_FIELDS = frozenset([
     "problem_id",
     "sub_step_id",
     "description",
@@ -40,90 +57,109 @@ REQUIRED_FIELDS = [
     "dependencies",
     "test_cases",
     "gold_solution",
-]
+])
 
 ALL_SUBSTEPS = load_substeps()
 
 
-@pytest.mark.parametrize(
-    "substep",
-    ALL_SUBSTEPS,
-    ids=[s["sub_step_id"] for s in ALL_SUBSTEPS],
-)
+@pytest.mark.parametrize("substep", ALL_SUBSTEPS, ids=operator.itemgetter("sub_step_id"))
 def test_schema(substep):
     """Each sub-step has all required fields."""
-    for field in REQUIRED_FIELDS:
-        assert field in substep, f"{substep['_source']}: missing field '{field}'"
-
-
-def test_jsonl_matches_markdown():
-    """JSONL files are up-to-date with their markdown sources."""
-    md_files = sorted(PROBLEMS_DIR.glob("starsim_t*.md"))
-    assert md_files, "No markdown files found in problems/"
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Run build_jsonl.py but write output to a temp dir so we don't
-        # overwrite the checked-in files.
-        build_script = PROBLEMS_DIR / "build_jsonl.py"
-        assert build_script.exists(), "problems/build_jsonl.py not found"
-
-        # Import the build module and generate JSONL to a temp location
-        tmpdir = Path(tmpdir)
-        for md_path in md_files:
-            # Import parse_markdown from build_jsonl
-            sys.path.insert(0, str(PROBLEMS_DIR))
-            try:
-                from build_jsonl import parse_markdown
-            finally:
-                sys.path.pop(0)
-
-            text = md_path.read_text()
-            problems = parse_markdown(text)
-            tmp_jsonl = tmpdir / md_path.with_suffix(".jsonl").name
-            with open(tmp_jsonl, "w") as f:
-                for problem in problems:
-                    f.write(json.dumps(problem) + "\n")
-
-            # Compare with the checked-in JSONL
-            checked_in = md_path.with_suffix(".jsonl")
-            assert checked_in.exists(), f"{checked_in.name} not found"
-
-            expected = []
-            with open(checked_in) as f:
-                for line in f:
-                    if line.strip():
-                        expected.append(json.loads(line))
-
-            assert len(problems) == len(expected), (
-                f"{checked_in.name}: markdown has {len(problems)} problems "
-                f"but JSONL has {len(expected)}"
-            )
-            for i, (got, want) in enumerate(zip(problems, expected)):
-                assert got == want, (
-                    f"{checked_in.name} line {i + 1} ({got.get('sub_step_id', '?')}): "
-                    f"JSONL does not match markdown. "
-                    f"Run 'python3 problems/build_jsonl.py' to regenerate."
-                )
+    missing = REQUIRED_FIELDS - substep.keys()
+    assert not missing, f"{SOURCES[id(substep)]}: missing fields {sorted(missing)}"
+
+
+MARKDOWN_FILES = sorted(PROBLEMS_DIR.glob("starsim_t*.md"))
+
+
+def test_markdown_sources_exist():
+    """There are problem markdown files to check the JSONL against."""
+    assert MARKDOWN_FILES, "No markdown files found in problems/"
+
+
+@pytest.mark.parametrize("md_path", MARKDOWN_FILES, ids=[p.stem for p in MARKDOWN_FILES])
+def test_jsonl_matches_markdown(md_path):
+    """JSONL file is up-to-date with its markdown source."""
+    build_script = PROBLEMS_DIR / "build_jsonl.py"
+    assert build_script.exists(), "problems/build_jsonl.py not found"
+
+    # Import parse_markdown and to_jsonl from build_jsonl
+    sys.path.insert(0, str(PROBLEMS_DIR))
+    try:
+        from build_jsonl import parse_markdown, to_jsonl
+    finally:
+        sys.path.pop(0)
+
+    problems = parse_markdown(md_path.read_text())
+
+    # Compare with the checked-in JSONL
+    checked_in = md_path.with_suffix(".jsonl")
+    assert checked_in.exists(), f"{checked_in.name} not found"
+
+    # A file written by build_jsonl.py matches byte for byte; only parse it
+    # when it doesn't, to find the offending line (or accept a file that
+    # differs only in formatting)
+    data = checked_in.read_bytes()
+    if to_jsonl(problems) == data:
+        return
+    expected = [_loads(line) for line in data.splitlines() if line.strip()]
+
+    assert len(problems) == len(expected), (
+        f"{checked_in.name}: markdown has {len(problems)} problems "
+        f"but JSONL has {len(expected)}"
+    )
+    for i, (got, want) in enumerate(zip(problems, expected)):
+        assert got == want, (
+            f"{checked_in.name} line {i + 1} ({got.get('sub_step_id', '?')}): "
+            f"JSONL does not match markdown. "
+            f"Run 'python3 problems/build_jsonl.py' to regenerate."
+        )
+
+
+# Namespaces defined by each sub-step's gold solution, keyed by sub_step_id
+_GOLD_NAMESPACES: dict[str, dict] = {}
+
+
+def gold_namespace(substep: dict) -> dict:
+    """Return a fresh copy of the namespace defined by a sub-step's gold solution.
+
+    The gold solution is executed once per sub-step; each call returns a
+    shallow copy, so test cases don't see each other's global assignments.
+    """
+    sub_step_id = substep["sub_step_id"]
+    template = _GOLD_NAMESPACES.get(sub_step_id)
+    if template is None:
+        template = {}
+        # dont_inherit: compile as eval does, without this module's __future__ imports
+        code = compile(substep["gold_solution"], f"<gold {sub_step_id}>", "exec", dont_inherit=True)
+        exec(code, template)
+        _GOLD_NAMESPACES[sub_step_id] = template
+    return dict(template)
+
+
+# One case per (sub-step, test case) so failures are reported individually
+# and pytest-xdist can spread them across workers
+GOLD_CASES = [
+    (substep, i, tc)
+    for substep in ALL_SUBSTEPS
+    for i, tc in enumerate(substep["test_cases"], 1)
+]
 
 
 @pytest.mark.parametrize(
-    "substep",
-    ALL_SUBSTEPS,
-    ids=[s["sub_step_id"] for s in ALL_SUBSTEPS],
+    "substep,i,tc",
+    GOLD_CASES,
+    ids=[f"{substep['sub_step_id']}::{tc['description']}" for substep, _, tc in GOLD_CASES],
 )
-def test_gold_solution(substep):
-    """Gold solution passes all test cases for the sub-step."""
-    # Build a namespace with the gold solution defined
-    ns: dict = {}
-    exec(substep["gold_solution"], ns)
-
-    for tc in substep["test_cases"]:
-        # Each test case can reference the function defined in the gold solution
-        try:
-            exec(tc["test"], ns)
-        except AssertionError:
-            raise
-        except Exception as exc:
-            pytest.fail(
-                f"{substep['sub_step_id']} / {tc['description']}: {type(exc).__name__}: {exc}"
-            )
+def test_gold_solution(substep, i, tc):
+    """Gold solution passes the test case."""
+    sub_step_id = substep["sub_step_id"]
+
+    # The test case can reference the function defined in the gold solution
+    ns = gold_namespace(substep)
+    try:
+        exec(compile(tc["test"], f"<test {sub_step_id} #{i}>", "exec", dont_inherit=True), ns)
+    except AssertionError:
+        raise
+    except Exception as exc:
+        pytest.fail(f"{sub_step_id} / {tc['description']}: {type(exc).__name__}: {exc}")